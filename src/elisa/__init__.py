@@ -27,10 +27,11 @@ from .models.parameter import (
 )
 from .util import (
     jax_debug_nans as jax_debug_nans,
-    jax_enable_x64,
+    jax_enable_x64 as jax_enable_x64,
     set_cpu_cores,
     set_jax_platform as set_jax_platform,
 )
 
-jax_enable_x64(True)
+# use double precision by default, unless JAX_ENABLE_X64 is set to false
+jax_enable_x64()
 set_cpu_cores(4)
@@ -305,9 +305,6 @@ def get_helper(fit: Fit) -> Helper:
 
     # get model parameters priors
     pid_to_pname: dict[ParamID, ParamName] = model_info.name
-    pname_to_pid: dict[ParamName, ParamID] = {
-        v: k for k, v in pid_to_pname.items()
-    }
     pid_to_prior: dict[ParamID, Distribution] = model_info.sample
     params_prior: dict[ParamName, Distribution] = {
         pid_to_pname[pid]: pid_to_prior[pid] for pid in pid_to_prior
@@ -316,6 +313,14 @@ def get_helper(fit: Fit) -> Helper:
     # get deterministic value getter function
     deterministic: dict[ParamID, Callable] = model_info.deterministic
 
+    # flatten the sample and deterministic sites used in numpyro model
+    sample_sites: tuple[tuple[ParamID, ParamName, Distribution], ...] = tuple(
+        (pid, pid_to_pname[pid], dist) for pid, dist in pid_to_prior.items()
+    )
+    deterministic_sites: tuple[tuple[ParamName, Callable], ...] = tuple(
+        (pid_to_pname[pid], fn) for pid, fn in deterministic.items()
+    )
+
     # get the likelihood function for each dataset
     likelihood_wrapper = {
         'chi2': chi2,
@@ -354,18 +359,15 @@ def get_helper(fit: Fit) -> Helper:
         #     }
 
         # get parameter value from prior
-        params_name_values = {
-            name: numpyro.sample(name, dist)
-            for name, dist in params_prior.items()
-        }
-        params_id_values = {
-            pname_to_pid[name]: value
-            for name, value in params_name_values.items()
-        }
+        params_name_values = {}
+        params_id_values = {}
+        for pid, name, dist in sample_sites:
+            value = numpyro.sample(name, dist)
+            params_name_values[name] = params_id_values[pid] = value
 
         # store composite parameters into chains
-        for pid, fn in deterministic.items():
-            numpyro.deterministic(pid_to_pname[pid], fn(params_id_values))
+        for name, fn in deterministic_sites:
+            numpyro.deterministic(name, fn(params_id_values))
 
         # the likelihood between observation and model for each dataset
         jax.tree.map(
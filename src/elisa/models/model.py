@@ -19,7 +19,12 @@ from scipy.sparse import sparray
 
 from elisa.data.base import ObservationData, ResponseData, SpectrumData
 from elisa.models.parameter import Parameter, UniformParameter
-from elisa.util.misc import build_namespace, define_fdjvp, make_pretty_table
+from elisa.util.misc import (
+    build_namespace,
+    define_fdjvp,
+    make_pretty_table,
+    replace_string,
+)
 
 if TYPE_CHECKING:
     from typing import Any, Callable, Literal
@@ -58,6 +63,8 @@ class Model(ABC):
 
     _comps: tuple[Component, ...]
     _additive_comps: tuple[Model, ...]
+    __latex: tuple[int, CompIDStrMapping, str] | None = None
+    __eval: tuple[tuple[Callable, ...], ModelEval] | None = None
     __initialized: bool = False
 
     def __init__(
@@ -84,9 +91,22 @@ class Model(ABC):
 
     @property
     def _cid_to_clatex(self) -> CompIDStrMapping:
-        clatex = [c.latex for c in self._comps]
-        clatex = build_namespace(clatex, latex=True)['namespace']
-        return dict(zip(self._comps_id, clatex))
+        return dict(self._get_latex()[0])
+
+    def _get_latex(self) -> tuple[CompIDStrMapping, str]:
+        """Get the component LaTeX mapping and the model LaTeX.
+
+        The result is cached until the LaTeX of any component is changed.
+        """
+        version = Component._latex_version
+        if self.__latex is None or self.__latex[0] != version:
+            clatex = [c.latex for c in self._comps]
+            clatex = build_namespace(clatex, latex=True)['namespace']
+            cid_to_clatex = dict(zip(self._comps_id, clatex))
+            latex = self._id_to_label(cid_to_clatex, 'latex')
+            self.__latex = (version, cid_to_clatex, latex)
+
+        return self.__latex[1:]
 
     def compile(self, *, model_info: ModelInfo | None = None) -> CompiledModel:
         """Compile the model for fast evaluation.
@@ -146,6 +166,26 @@ class Model(ABC):
         """Get side-effect free model evaluation function."""
         pass
 
+    def _cached_eval(
+        self,
+        make_eval: Callable[..., ModelEval],
+        *fns: Callable,
+    ) -> ModelEval:
+        """Get the evaluation function made by ``make_eval(*fns)``.
+
+        The result is cached and rebuilt only if any of `fns` changes, so
+        that the same function object, and hence its JIT cache, is reused.
+        """
+        cached = self.__eval
+        if (
+            cached is None
+            or len(cached[0]) != len(fns)
+            or any(i is not j for i, j in zip(cached[0], fns))
+        ):
+            cached = self.__eval = (fns, make_eval(*fns))
+
+        return cached[1]
+
     @property
     def name(self) -> str:
         """Model name."""
@@ -154,15 +194,7 @@ class Model(ABC):
     @property
     def latex(self) -> str:
         r""":math:`\LaTeX` format of the model."""
-        latex = [c.latex for c in self._comps]
-        cid_to_latex = dict(
-            zip(
-                self._comps_id,
-                build_namespace(latex, latex=True)['namespace'],
-            )
-        )
-
-        return self._id_to_label(cid_to_latex, 'latex')
+        return self._get_latex()[1]
 
     @property
     @abstractmethod
@@ -192,11 +224,7 @@ class Model(ABC):
             raise ValueError(f'unknown label type: {label_type}')
 
         label = self._name if label_type == 'name' else self._latex
-
-        for k, v in mapping.items():
-            label = label.replace(k, v)
-
-        return label
+        return replace_string(label, mapping)
 
     def _compile_model_fn(self, model_info: ModelInfo) -> ModelCompiledFn:
         """Get the model evaluation function."""
@@ -230,16 +258,14 @@ class Model(ABC):
             for comp in additive_comps
         ]
 
-        @jax.jit
-        def _fn(egrid: JAXArray, params: ParamIDValMapping) -> JAXArray:
-            return [f(egrid, params) for f in fns]
-
         @jax.jit
         def fn(
             egrid: JAXArray, params: ParamIDValMapping
         ) -> dict[tuple[str, str], JAXArray]:
             """The evaluation function of additive components."""
-            return dict(zip(comps_labels, _fn(egrid, params)))
+            return {
+                label: f(egrid, params) for label, f in zip(comps_labels, fns)
+            }
 
         return fn
 
@@ -267,6 +293,20 @@ class Model(ABC):
             '</details>'
         )
 
+    def __getstate__(self) -> dict:
+        # the cached LaTeX is keyed on the version counter of this process,
+        # drop it and the cached evaluation function so that both are rebuilt
+        state = self.__dict__.copy()
+        state.pop('_Model__latex', None)
+        state.pop('_Model__eval', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        state = dict(state)
+        state.pop('_Model__latex', None)
+        state.pop('_Model__eval', None)
+        self.__dict__.update(state)
+
     def __delattr__(self, key: str):
         if self.__initialized and hasattr(self, key):
             raise AttributeError("can't delete attribute")
@@ -335,6 +375,9 @@ class CompiledModel:
         )
         self._fn = fn
         self._additive_fn = additive_fn
+        self._batched_fns: dict[
+            int, tuple[ModelCompiledFn, AdditiveFn | None]
+        ] = {}
         self._type = mtype
         self._model_info = model_info
         self._nparam = len(pname_to_pid)
@@ -396,14 +439,21 @@ class CompiledModel:
             if any(s != shape for s in shapes[1:]):
                 raise ValueError('all params must have the same shape')
 
-            # iteratively vmap and jit over params dimensions
-            # use the nested-jit trick to reduce the compilation time
-            for _ in range(len(shape)):
-                fn = jax.jit(jax.vmap(fn, in_axes=(None, 0)))
+            ndim = len(shape)
+            if ndim not in self._batched_fns:
+                # iteratively vmap and jit over params dimensions
+                # use the nested-jit trick to reduce the compilation time
+                for _ in range(ndim):
+                    fn = jax.jit(jax.vmap(fn, in_axes=(None, 0)))
 
-            if add_fn is not None:
-                for _ in range(len(shape)):
-                    add_fn = jax.jit(jax.vmap(add_fn, in_axes=(None, 0)))
+                if add_fn is not None:
+                    for _ in range(ndim):
+                        add_fn = jax.jit(jax.vmap(add_fn, in_axes=(None, 0)))
+
+                # reuse the wrappers so that jax can hit its compilation cache
+                self._batched_fns[ndim] = (fn, add_fn)
+
+            fn, add_fn = self._batched_fns[ndim]
 
         return fn, add_fn, params
 
@@ -1165,13 +1215,15 @@ class UniComponentModel(Model):
     @property
     def eval(self) -> ModelEval:
         comp_id = self._component._id
-        _fn = self._component.eval
 
-        def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
-            """The model evaluation function"""
-            return _fn(egrid, params[comp_id])
+        def make_eval(_fn: CompEval) -> ModelEval:
+            def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
+                """The model evaluation function"""
+                return _fn(egrid, params[comp_id])
+
+            return jax.jit(fn)
 
-        return jax.jit(fn)
+        return self._cached_eval(make_eval, self._component.eval)
 
     @property
     def type(self) -> Literal['add', 'mul']:
@@ -1262,14 +1314,33 @@ class CompositeModel(Model):
     @property
     def eval(self) -> ModelEval:
         op = self._op
-        lhs = self._operands[0].eval
-        rhs = self._operands[1].eval
 
-        def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
-            """The model evaluation function"""
-            return op(lhs(egrid, params), rhs(egrid, params))
+        def make_eval(*fns: ModelEval) -> ModelEval:
+            def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
+                """The model evaluation function"""
+                return reduce(op, [f(egrid, params) for f in fns])
+
+            return jax.jit(fn)
 
-        return jax.jit(fn)
+        fns = [m.eval for m in self._chained_operands]
+        return self._cached_eval(make_eval, *fns)
+
+    @property
+    def _chained_operands(self) -> list[Model]:
+        """Operands of the left-associative chain of the same operator.
+
+        For example, the operands of ``((m1 + m2) + m3) + m4`` are
+        ``[m1, m2, m3, m4]``, which can be evaluated from left to right in a
+        single function, rather than in a nested call of functions.
+        """
+        lhs, rhs = self._operands
+        op = self._op_symbol
+        if isinstance(lhs, CompositeModel) and lhs._op_symbol == op:
+            operands = lhs._chained_operands
+        else:
+            operands = [lhs]
+        operands.append(rhs)
+        return operands
 
     @property
     def _additive_comps(self) -> tuple[Model, ...]:
@@ -1550,6 +1621,7 @@ class Component(ABC, metaclass=ComponentMeta):
     _args: tuple[str, ...] = ()  # extra args passed to subclass __init__
     _kwargs: tuple[str, ...] = ()  # extra kwargs passed to subclass __init__
     _staticmethod: tuple[str, ...] = ()  # methods need to be static
+    _latex_version: int = 0  # bumped whenever LaTeX of a component changes
     __initialized: bool = False
 
     def __init__(self, params: dict, latex: str | None):
@@ -1588,6 +1660,7 @@ class Component(ABC, metaclass=ComponentMeta):
     @latex.setter
     def latex(self, latex: str):
         self._latex = str(latex)
+        Component._latex_version += 1
 
     @property
     @abstractmethod
@@ -1684,6 +1757,7 @@ class NumericalIntegral(Component):
 
     _kwargs = ('method',)
     _continuum_jit: CompEval | None = None
+    _integral_cache: tuple[CompEval, str, CompEval] | None = None
     _staticmethod = ('continuum',)
 
     def __init__(
@@ -1704,6 +1778,14 @@ class NumericalIntegral(Component):
         return self._make_integral(self._continuum_jit)
 
     def _make_integral(self, continuum: CompEval):
+        cached = self._integral_cache
+        if (
+            cached is not None
+            and cached[0] is continuum
+            and cached[1] == self.method
+        ):
+            return cached[2]
+
         mtype = self.type
 
         if self.method == 'trapz':
@@ -1733,7 +1815,10 @@ class NumericalIntegral(Component):
         else:
             raise NotImplementedError(f"integration method '{self.method}'")
 
-        return jax.jit(fn)
+        fn = jax.jit(fn)
+        self._integral_cache = (continuum, self.method, fn)
+
+        return fn
 
     @staticmethod
     @abstractmethod
@@ -1920,14 +2005,17 @@ class ConvolvedModel(Model):
     @property
     def eval(self) -> ModelEval:
         comp_id = self._op._id
-        _fn = self._op.eval
-        _model_fn = self._model.eval
 
-        def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
-            """The convolved model evaluation function."""
-            return _fn(egrid, params[comp_id], lambda e: _model_fn(e, params))
+        def make_eval(_fn: ConvolveEval, _model_fn: ModelEval) -> ModelEval:
+            def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
+                """The convolved model evaluation function."""
+                return _fn(
+                    egrid, params[comp_id], lambda e: _model_fn(e, params)
+                )
+
+            return jax.jit(fn)
 
-        return jax.jit(fn)
+        return self._cached_eval(make_eval, self._op.eval, self._model.eval)
 
     @property
     def type(self) -> Literal['add', 'mul']:
@@ -2097,10 +2185,10 @@ def get_model_info(
         The model parameter information dict.
     """
     # get all parameter information
-    params_info: dict[ParamID, ParamInfo] = reduce(
-        lambda x, y: x | y,
-        [comp[name]._info for comp in comps for name in comp.param_names],
-    )
+    params_info: dict[ParamID, ParamInfo] = {}
+    for comp in comps:
+        for name in comp.param_names:
+            params_info.update(comp[name]._info)
 
     # mapping from pid to assigned component id and parameter name
     comp_param: dict[ParamID, tuple[CompID, CompParamName] | None] = {
@@ -2139,48 +2227,38 @@ def get_model_info(
     aux_latex = build_namespace(aux_latex, latex=True, prime=True)['namespace']
     latex_mapping = dict(zip(aux_params.keys(), aux_latex))
 
-    # record the LaTeX format of component parameters from _config
-    latex_mapping |= {
-        comp[name]._id: comp._config[i].latex
-        for comp in comps
-        for (i, name) in enumerate(comp.param_names)
-    }
+    # record the LaTeX format and unit of component parameters from _config
+    comp_latex = {}
+    unit_mapping = {}
+    for comp in comps:
+        for cfg, name in zip(comp._config, comp.param_names):
+            pid = comp[name]._id
+            comp_latex[pid] = cfg.latex
+            unit_mapping[pid] = cfg.unit
+    latex_mapping |= comp_latex
 
     # TODO: record aux params unit & unit consistency check
-    # record the unit of component parameters from _config
-    unit_mapping = {
-        comp[name]._id: comp._config[i].unit
-        for comp in comps
-        for (i, name) in enumerate(comp.param_names)
-    }
-    unit_mapping |= {pid: '' for pid, info in aux_params.items()}
+    unit_mapping |= dict.fromkeys(aux_params, '')
 
     # record whether the parameter is logarithmic
     log = {pid: params_info[pid].log for pid in name_mapping}
 
-    # record the value of fixed parameters
-    fixed = {
-        pid: info.default
-        for pid, info in params_info.items()
-        if (pid in name_mapping) and info.fixed and (not info.integrate)
-    }
-
-    # integral operator
-    integrate = {
-        pid: info.integrate
-        for pid, info in params_info.items()
-        if info.integrate and not info.composite
-    }
-
-    # record the sample distribution of free parameters
-    sample: dict[ParamID, Distribution] = {
-        pid: info.dist for pid, info in params_info.items() if info.dist
-    }
-
-    # record the default value of free parameters
-    default: dict[ParamID, JAXFloat] = {
-        pid: params_info[pid].default for pid in sample
-    }
+    # record the value of fixed parameters, the integral operator, and the
+    # sample distribution and default value of free parameters
+    fixed = {}
+    integrate = {}
+    sample: dict[ParamID, Distribution] = {}
+    default: dict[ParamID, JAXFloat] = {}
+    for pid, info in params_info.items():
+        if info.integrate:
+            if not info.composite:
+                integrate[pid] = info.integrate
+        elif info.fixed and (pid in name_mapping):
+            fixed[pid] = info.default
+
+        if info.dist:
+            sample[pid] = info.dist
+            default[pid] = info.default
 
     # ========== generate component parameter value getter function ===========
     def factory1(
@@ -2198,13 +2276,13 @@ def get_model_info(
         pname_to_pid: dict[CompParamName, ParamID],
     ) -> Callable[[ParamIDValMapping], NameValMapping]:
         """Generate component parameter value getter."""
+        getters = tuple(
+            (pname, pid_to_value[pid]) for pname, pid in pname_to_pid.items()
+        )
 
         def fn(value_mapping: ParamIDValMapping) -> NameValMapping:
             """Component parameter value getter."""
-            return {
-                pname: pid_to_value[pid](value_mapping)
-                for pname, pid in pname_to_pid.items()
-            }
+            return {pname: getter(value_mapping) for pname, getter in getters}
 
         return fn
 
@@ -311,6 +311,7 @@ class PhotonAbsorption(NumIntMultiplicative):
     _kwargs = ('abund', 'xsect', 'method')
     _default_abund: str
     _default_xsect: str
+    _abs_continuum: tuple[str, str, CompEval] | None = None
 
     def __init__(
         self,
@@ -349,11 +350,16 @@ class PhotonAbsorption(NumIntMultiplicative):
         abs_model = self.__class__.__name__.lower()
         abund = self.abund
         xsect = self.xsect
-        continuum = jax.jit(
-            lambda egrid, params: self._continuum_jit(
-                egrid, params, abs_model, abund, xsect
+        cached = self._abs_continuum
+        if cached is not None and cached[:2] == (abund, xsect):
+            continuum = cached[2]
+        else:
+            continuum = jax.jit(
+                lambda egrid, params: self._continuum_jit(
+                    egrid, params, abs_model, abund, xsect
+                )
             )
-        )
+            self._abs_continuum = (abund, xsect, continuum)
         return self._make_integral(continuum)
 
     @staticmethod
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Sequence
+from functools import partial
 from typing import TYPE_CHECKING, NamedTuple, get_args
 
 import jax.numpy as jnp
@@ -28,10 +30,21 @@ if TYPE_CHECKING:
         ParamIDValMapping,
     )
 
+# operator symbol -> (function, name format, LaTeX format)
+_OPERATORS: dict[str, tuple[Callable[..., JAXFloat], str, str]] = {
+    '+': (jnp.add, '{} + {}', '{{{}}} + {{{}}}'),
+    '-': (jnp.subtract, '{} - {}', '{{{}}} - {{{}}}'),
+    '*': (jnp.multiply, '{} * {}', r'{{{}}} \times {{{}}}'),
+    '/': (jnp.divide, '{} / {}', r'{{{}}} / {{{}}}'),
+    '^': (jnp.power, '{}^{}', r'{{{}}}^{{{}}}'),
+}
+
 
 class AssignmentTracker:
     """Track component assignment of a parameter."""
 
+    __slots__ = ('_history',)
+
     def __init__(self):
         self._history = []
 
@@ -113,11 +126,35 @@ class Parameter(ABC):
     _id: ParamID
     _tracker: AssignmentTracker
     _nodes_id: tuple[ParamID, ...]
+    _version: int = 0  # bumped whenever the setup of any parameter changes
 
     def __init__(self):
         self._id = hex(id(self))[2:]
         self._tracker = AssignmentTracker()
         self._nodes_id = (self._id,)
+        self._cache: dict[str, tuple[int, Any]] = {}
+
+    def _get_cached(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Get the cached value of `key`, or compute and cache it by `fn`.
+
+        The cache is invalidated whenever the setup of any parameter changes.
+        """
+        version = Parameter._version
+        cached = self._cache.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._cache[key] = (version, fn())
+        return cached[1]
+
+    def __getstate__(self) -> dict:
+        # the cache is keyed on the version counter of this process,
+        # so it is not valid in another one
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._cache = {}
 
     def _id_to_label(
         self,
@@ -227,37 +264,17 @@ class Parameter(ABC):
                 f"'{type(lhs).__name__}' and '{type(rhs).__name__}'"
             )
 
-        op_symbol = op
-
-        if op == '+':
-            op = jnp.add
-            op_name = '{} + {}'
-            op_latex = '{{{}}} + {{{}}}'
-        elif op == '-':
-            op = jnp.subtract
-            op_name = '{} - {}'
-            op_latex = '{{{}}} - {{{}}}'
-        elif op == '*':
-            op = jnp.multiply
-            op_name = '{} * {}'
-            op_latex = r'{{{}}} \times {{{}}}'
-        elif op == '/':
-            op = jnp.divide
-            op_name = '{} / {}'
-            op_latex = r'{{{}}} / {{{}}}'
-        elif op == '^':
-            op = jnp.power
-            op_name = '{}^{}'
-            op_latex = r'{{{}}}^{{{}}}'
-        else:
+        if op not in _OPERATORS:
             raise NotImplementedError(f'op {op}')
 
+        fn, op_name, op_latex = _OPERATORS[op]
+
         return CompositeParameter(
             params=[lhs, rhs],
-            op=op,
+            op=fn,
             op_name=op_name,
             op_latex=op_latex,
-            op_symbol=op_symbol,
+            op_symbol=op,
         )
 
 
@@ -292,6 +309,7 @@ class ParameterHelper(Parameter):
     @latex.setter
     def latex(self, latex):
         self._latex = str(latex)
+        Parameter._version += 1
 
     @property
     @abstractmethod
@@ -346,7 +364,7 @@ class DistParameter(ParameterHelper):
         if jnp.shape(default) != ():
             raise ValueError('default must be a scalar')
 
-        if not bool(dist._validate_sample(default)):
+        if not bool(dist.support(default)):
             raise ValueError('default should be within the prior support')
 
         self._dist = dist
@@ -380,10 +398,11 @@ class DistParameter(ParameterHelper):
         if jnp.shape(default) != ():
             raise ValueError('default must be a scalar')
 
-        if not bool(self._dist._validate_sample(default)):
+        if not bool(self._dist.support(default)):
             raise ValueError('default should be within the dist support')
 
         self._default = jnp.asarray(default, float)
+        Parameter._version += 1
 
     @property
     def log(self) -> bool:
@@ -495,6 +514,7 @@ class UniformParameter(DistParameter):
     @latex.setter
     def latex(self, latex: str):
         self._latex = str(latex)
+        Parameter._version += 1
 
     @property
     def default(self) -> JAXFloat:
@@ -538,6 +558,8 @@ class UniformParameter(DistParameter):
             else:
                 self._dist = Uniform(self._min, self._max)
 
+            Parameter._version += 1
+
     @property
     def fixed(self) -> bool:
         return self._fixed
@@ -545,6 +567,7 @@ class UniformParameter(DistParameter):
     @fixed.setter
     def fixed(self, fixed: bool):
         self._fixed = bool(fixed)
+        Parameter._version += 1
 
     @property
     def _dist_expr(self) -> str:
@@ -612,6 +635,8 @@ class UniformParameter(DistParameter):
             else:
                 self._dist = Uniform(self._min, self._max)
 
+        Parameter._version += 1
+
 
 class ConstantParameter(ParameterHelper):
     r"""Constant parameter.
@@ -669,6 +694,7 @@ class ConstantValue(ConstantParameter):
             raise ValueError('default must be a scalar')
 
         self._default = jnp.asarray(default, float)
+        Parameter._version += 1
 
     @property
     def _info(self) -> dict[ParamID, ParamInfo]:
@@ -756,6 +782,7 @@ class ConstantInterval(ConstantParameter):
             raise ValueError('interval must be a 2-element sequence')
 
         self._default = jnp.asarray(default, float)
+        Parameter._version += 1
 
     @property
     def method(self) -> AdaptQuadMethod:
@@ -769,6 +796,7 @@ class ConstantInterval(ConstantParameter):
             raise ValueError(f'method must be one of {supported}')
 
         self._method = value
+        Parameter._version += 1
 
     @property
     def _info(self) -> dict[ParamID, ParamInfo]:
@@ -829,20 +857,15 @@ class CompositeParameter(Parameter):
         *,
         op_symbol: Literal['+', '-', '*', '/', '^'] | None = None,
     ):
-        # check if the type of params is parameter or sequence
-        if not isinstance(params, (Parameter, Sequence)):
-            raise TypeError(
-                'parameters must be a Parameter or a sequence of Parameter'
-            )
-
-        # make params a list
+        # check if params is a parameter or a sequence of parameters,
+        # and make params a list
         if isinstance(params, Parameter):
             params = [params]
-        else:
+        elif isinstance(params, Sequence) and all(
+            isinstance(i, Parameter) for i in params
+        ):
             params = list(params)
-
-        # check if params are all parameters
-        if not all(isinstance(i, Parameter) for i in params):
+        else:
             raise TypeError(
                 'parameters must be a Parameter or a sequence of Parameter'
             )
@@ -869,14 +892,15 @@ class CompositeParameter(Parameter):
 
         # correct Parameter's _nodes_id attribute
         nodes = []
-        for p in self._params:
-            stack = [p]
-            while stack:
-                node = stack.pop(0)
-                if isinstance(node, CompositeParameter):
-                    stack = list(node._params) + stack
-                elif node not in nodes:
-                    nodes.append(node)
+        seen = set()
+        stack = deque(self._params)
+        while stack:
+            node = stack.popleft()
+            if isinstance(node, CompositeParameter):
+                stack.extendleft(reversed(node._params))
+            elif node not in seen:
+                seen.add(node)
+                nodes.append(node)
         self._nodes = tuple(nodes)
         self._nodes_id = tuple(p._id for p in self._nodes)
 
@@ -888,8 +912,44 @@ class CompositeParameter(Parameter):
                 ],
             )
         )
+        self._label_fmts = self._make_label_fmts()
         self._name = self._id_to_label(pid_to_pname, 'name')
 
+    def _make_label_fmts(self) -> tuple[str, ...]:
+        """Get the format of sub-parameters' label, with parentheses added
+        according to operator precedence.
+        """
+        if not self._op_symbol:
+            return tuple(
+                '({})' if isinstance(p, CompositeParameter) else '{}'
+                for p in self._params
+            )
+
+        def fmt(p: Parameter, composite_only: bool = False) -> str:
+            """Add parentheses to a composite of lower precedence."""
+            if isinstance(p, CompositeParameter) and (
+                composite_only or p._op_symbol not in {'*', '/', '^'}
+            ):
+                return '({})'
+            else:
+                return '{}'
+
+        op = self._op_symbol
+        lhs, rhs = self._params
+
+        if op == '+':
+            return '{}', '{}'
+        elif op == '-':
+            return '{}', fmt(rhs)
+        elif op == '*':
+            return fmt(lhs), fmt(rhs)
+        elif op == '/':
+            return fmt(lhs), '({})'
+        elif op == '^':
+            return fmt(lhs, True), fmt(rhs, True)
+        else:
+            raise NotImplementedError(f'op_symbol: {op}')
+
     def _id_to_label(
         self,
         mapping: dict[ParamID, str],
@@ -901,75 +961,10 @@ class CompositeParameter(Parameter):
         if self._id in mapping:
             return mapping[self._id]
         else:
-            if self._op_symbol:
-                op = self._op_symbol
-                lhs, rhs = self._params
-
-                if op == '+':
-                    lhs_fmt = rhs_fmt = '{}'
-
-                elif op == '-':
-                    lhs_fmt = '{}'
-
-                    if isinstance(
-                        rhs, CompositeParameter
-                    ) and rhs._op_symbol not in {'*', '/', '^'}:
-                        rhs_fmt = '({})'
-                    else:
-                        rhs_fmt = '{}'
-
-                elif op == '*':
-                    if isinstance(
-                        lhs, CompositeParameter
-                    ) and lhs._op_symbol not in {'*', '/', '^'}:
-                        lhs_fmt = '({})'
-                    else:
-                        lhs_fmt = '{}'
-
-                    if isinstance(
-                        rhs, CompositeParameter
-                    ) and rhs._op_symbol not in {'*', '/', '^'}:
-                        rhs_fmt = '({})'
-                    else:
-                        rhs_fmt = '{}'
-
-                elif op == '/':
-                    if isinstance(
-                        lhs, CompositeParameter
-                    ) and lhs._op_symbol not in {'*', '/', '^'}:
-                        lhs_fmt = '({})'
-                    else:
-                        lhs_fmt = '{}'
-
-                    rhs_fmt = '({})'
-
-                elif op == '^':
-                    if isinstance(lhs, CompositeParameter):
-                        lhs_fmt = '({})'
-                    else:
-                        lhs_fmt = '{}'
-
-                    if isinstance(rhs, CompositeParameter):
-                        rhs_fmt = '({})'
-                    else:
-                        rhs_fmt = '{}'
-
-                else:
-                    raise NotImplementedError(f'op_symbol: {op}')
-
-                labels = (
-                    lhs_fmt.format(lhs._id_to_label(mapping, label_type)),
-                    rhs_fmt.format(rhs._id_to_label(mapping, label_type)),
-                )
-
-            else:
-                labels = tuple(
-                    (
-                        '({})' if isinstance(p, CompositeParameter) else '{}'
-                    ).format(p._id_to_label(mapping, label_type))
-                    for p in self._params
-                )
-
+            labels = (
+                fmt.format(p._id_to_label(mapping, label_type))
+                for fmt, p in zip(self._label_fmts, self._params)
+            )
             temp = self._op_name if label_type == 'name' else self._op_latex
             return temp.format(*labels)
 
@@ -989,6 +984,10 @@ class CompositeParameter(Parameter):
 
     @property
     def latex(self) -> str:
+        return self._get_cached('latex', self._make_latex)
+
+    def _make_latex(self) -> str:
+        """Compose the LaTeX from sub-parameters."""
         nodes_latex = [p.latex for p in self._nodes]
         latex = build_namespace(nodes_latex, True, True)['namespace']
         pid_to_latex = dict(zip(self._nodes_id, latex))
@@ -1001,24 +1000,36 @@ class CompositeParameter(Parameter):
                 'cannot get default value of a composite interval'
             )
 
+        return self._get_cached('default', self._make_default)
+
+    def _make_default(self) -> JAXFloat:
+        """Compose the default value from sub-parameters."""
         return self._op(*[i.default for i in self._params])
 
     @property
     def log(self) -> bool:
         """If the sub-parameters are all logarithmically parameterized."""
-        return all(i.log for i in self._params)
+        return self._get_cached(
+            'log', lambda: all(i.log for i in self._params)
+        )
 
     @property
     def fixed(self) -> bool:
         """If the sub-parameters are all fixed."""
-        return all(i.fixed for i in self._params)
+        return self._get_cached(
+            'fixed', lambda: all(i.fixed for i in self._params)
+        )
 
     @property
     def _info(self) -> dict[ParamID, ParamInfo]:
+        return dict(self._get_cached('info', self._make_info))
+
+    def _make_info(self) -> dict[ParamID, ParamInfo]:
+        """Collect the information of the parameter and sub-parameters."""
         info = {
             self._id: ParamInfo(
-                name=lambda mapping: self._id_to_label(mapping, 'name'),
-                latex=lambda mapping: self._id_to_label(mapping, 'latex'),
+                name=partial(self._id_to_label, label_type='name'),
+                latex=partial(self._id_to_label, label_type='latex'),
                 default=jnp.nan,  # this is not supposed to be used
                 bound='',  # this is not supposed to be used
                 prior='',  # this is not supposed to be used
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib
+import math
+from collections import OrderedDict
 from collections.abc import Sequence
 
 import arviz as az
 import corner
 import matplotlib.pyplot as plt
 import numpy as np
+import xarray as xr
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import LogFormatterMathtext, LogFormatterSciNotation
 
 from elisa.plot.util import (
     gaussian_kernel_smooth,
@@ -16,10 +24,14 @@ from elisa.plot.util import (
 )
 from elisa.util.misc import report_interval
 
+# cache of kernel density estimates, keyed on a digest of the samples
+_KDE_CACHE: OrderedDict[tuple, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+_KDE_CACHE_SIZE = 128
+
 
 def plot_corner(
     idata: az.InferenceData,
-    bins: int | Sequence[int] = 40,
+    bins: int | Sequence[int] | None = None,
     hist_bin_factor: float | Sequence[float] = 1.5,
     params: str | Sequence[str] | None = None,
     plot_range: Sequence[float] | None = None,
@@ -29,6 +41,8 @@ def plot_corner(
     labels: str | Sequence[str] | None = None,
     color: str = None,
     divergences: bool = True,
+    fig: plt.Figure | None = None,
+    backend: str | None = None,
 ):
     """Plot posterior corner plot.
 
@@ -39,7 +53,8 @@ def plot_corner(
     bins : int or list of int, optional
         The number of bins to use in histograms, either as a fixed value for
         all dimensions, or as a list of integers for each dimension.
-        The default is 40.
+        The default is ``int(min(40, max(10, sqrt(n / 20))))``, where ``n``
+        is the number of posterior samples.
     hist_bin_factor : float or list of float, optional
         This is a factor (or list of factors, one for each dimension) that
         will multiply the bin specifications when making the 1-D histograms.
@@ -63,6 +78,16 @@ def plot_corner(
         Color to use for the plot.
     divergences : bool, optional
         Whether to mark diverging samples.
+    fig : plt.Figure, optional
+        Figure to draw the corner plot into, e.g., the one returned by a
+        previous call. Its content is cleared first, and its axes are reused
+        if it has the same number of parameters.
+    backend : str, optional
+        Name of the Matplotlib backend used to render the figure, e.g.,
+        ``'agg'``, ``'pdf'``, ``'svg'`` or ``'module://name'``, same as
+        :func:`matplotlib.use`. If given, the figure is created without
+        pyplot and the interactive backend, which is faster when the figure
+        is only to be saved. Ignored if `fig` is given.
 
     Returns
     -------
@@ -71,20 +96,14 @@ def plot_corner(
 
     """
     posterior = idata['posterior']
-
-    if params is None:
-        params = list(posterior.data_vars.keys())
-    elif isinstance(params, str):
-        params = [params]
-    else:
-        params = list(params)
-
+    params = _resolve_params(posterior, params)
     posterior = posterior[params]
 
-    all_params = posterior.data_vars.keys()
-    not_found = set(params) - set(all_params)
-    if not_found:
-        raise ValueError(f'parameter {not_found} not found in posterior')
+    if bins is None:
+        # fewer bins for fewer samples, so that sparse 2d histograms are not
+        # contoured over mostly empty cells
+        n = posterior.chain.size * posterior.draw.size
+        bins = int(min(40, max(10, np.sqrt(n / 20))))
 
     if titles is None:
         titles = params
@@ -134,55 +153,123 @@ def plot_corner(
     else:
         color = str(color)
 
-    plt.rcParams['axes.formatter.min_exponent'] = 3
     c1, c2 = get_contour_colors(color, len(levels), 0.8, 2.0)
 
+    if fig is None:
+        if backend is not None:
+            # same figure size as the one created by corner
+            k = len(params)
+            dim = 2.0 * k + 2.0 * (k - 1) * 0.05 + 1.4
+            fig = _make_figure(backend, figsize=(dim, dim))
+    else:
+        if len(fig.axes) == len(params) ** 2:
+            for ax in fig.axes:
+                ax.cla()
+        else:
+            fig.clear()
+
+    samples = _stack_samples([posterior[p].values.ravel() for p in params])
+
     if plot_range is None:
-        vmin = {p: posterior[p].values.min() for p in params}
-        vmax = {p: posterior[p].values.max() for p in params}
-        if any(vmin[p] == vmax[p] for p in params):
+        # get the limits from the stacked samples, which may be rounded to
+        # float32, so that no sample falls outside the histograms
+        vmin = samples.min(axis=0).tolist()
+        vmax = samples.max(axis=0).tolist()
+        # the range must be given explicitly when reusing axes, otherwise
+        # corner extends the limits of the cleared axes
+        if fig is not None or any(i == j for i, j in zip(vmin, vmax)):
             plot_range = [
-                (vmin[p], vmax[p]) if vmin[p] != vmax[p] else 0.99
-                for p in params
+                (i, j) if i != j else 0.99 for i, j in zip(vmin, vmax)
             ]
 
-    fig = corner.corner(
-        idata,
-        bins=bins,
-        range=plot_range,
-        axes_scale=axes_scale,
-        color=color,
-        hist_bin_factor=hist_bin_factor,
-        titles=titles,
-        labels=labels,
-        show_titles=True,
-        title_fmt=None,
-        quantiles=[0.15865, 0.5, 0.84135],
-        use_math_text=True,
-        labelpad=-0.08,
-        divergences=divergences,
-        divergences_kwargs={'color': 'red', 'alpha': 0.3, 'ms': 1},
-        var_names=params,
-        # kwargs for corner.hist2d
-        levels=levels,
-        plot_datapoints=True,
-        plot_density=False,
-        plot_contours=True,
-        fill_contours=True,
-        no_fill_contours=True,
-        contour_kwargs={'colors': c1},
-        contourf_kwargs={'colors': ['white'] + c2, 'alpha': 0.75},
-        data_kwargs={'color': c2[0], 'alpha': 0.75, 'ms': 1.5},
-    )
+    # use the serial algorithm of contourpy, which is faster than the default
+    rc = {}
+    if 'contour.algorithm' in plt.rcParams:  # matplotlib >= 3.6
+        rc['contour.algorithm'] = 'serial'
+
+    with plt.rc_context(rc):
+        fig = corner.corner(
+            samples,
+            bins=bins,
+            range=plot_range,
+            axes_scale=axes_scale,
+            color=color,
+            hist_bin_factor=hist_bin_factor,
+            titles=titles,
+            labels=labels,
+            show_titles=True,
+            title_fmt=None,
+            quantiles=[0.15865, 0.5, 0.84135],
+            use_math_text=True,
+            labelpad=-0.08,
+            fig=fig,
+            # kwargs for corner.hist2d
+            levels=levels,
+            plot_datapoints=True,
+            plot_density=False,
+            plot_contours=True,
+            fill_contours=True,
+            no_fill_contours=True,
+            contour_kwargs={'colors': c1},
+            contourf_kwargs={'colors': ['white'] + c2, 'alpha': 0.75},
+            data_kwargs={'color': c2[0], 'alpha': 0.75, 'ms': 1.5},
+        )
+
+    if divergences and 'sample_stats' in idata:
+        diverging = idata['sample_stats']['diverging'].values.ravel()
+        # skip the overplot if there is no divergence
+        divergences = bool(diverging.any())
+    else:
+        divergences = False
+
+    if divergences:
+        corner.overplot_points(
+            fig,
+            samples[diverging],
+            color='red',
+            alpha=0.3,
+            ms=1,
+            rasterized=True,
+        )
+
+    _set_log_formatter(fig)
 
     return fig
 
 
+def _stack_samples(samples: Sequence[np.ndarray]) -> np.ndarray:
+    """Stack samples into an (nsample, nparam) array for corner plot.
+
+    The samples are stored in float32 if the precision is enough to resolve
+    their spread, which halves the memory of the stacked array. Each sample
+    is cast as it is stacked, without a float64 copy of the whole stack.
+    """
+    vmin = np.array([s.min() for s in samples])
+    vmax = np.array([s.max() for s in samples])
+    absmax = np.maximum(np.abs(vmin), np.abs(vmax))
+    ptp = vmax - vmin
+    f32 = np.finfo(np.float32)
+    if (
+        np.all(np.isfinite(ptp))
+        and np.all(absmax < f32.max)
+        and np.all((ptp == 0.0) | (ptp > 1e4 * f32.eps * absmax))
+    ):
+        dtype = np.float32
+    else:
+        dtype = np.float64
+
+    stacked = np.empty((samples[0].size, len(samples)), dtype=dtype)
+    for i, s in enumerate(samples):
+        stacked[:, i] = s
+    return stacked
+
+
 def plot_trace(
     idata: az.InferenceData,
     params: str | Sequence[str] | None = None,
     axes_scale: str | Sequence[str] | None = None,
     labels: str | Sequence[str] | None = None,
+    backend: str | None = None,
 ) -> plt.Figure:
     """Plot posterior sampling trace.
 
@@ -197,36 +284,44 @@ def plot_trace(
         use that for all dimensions. Scale must be ``'linear'`` or ``'log'``.
     labels : str, or list of str, optional
         Labels to be displayed in y-axis label.
+    backend : str, optional
+        Name of the Matplotlib backend used to render the figure, e.g.,
+        ``'agg'``, ``'pdf'``, ``'svg'`` or ``'module://name'``, same as
+        :func:`matplotlib.use`. If given, the figure is created without
+        pyplot and the interactive backend, which is faster when the figure
+        is only to be saved.
 
     Returns
     -------
     fig : plt.Figure
         The figure containing the trace plot.
     """
-    colors = get_colors(len(idata['posterior']['chain']), palette='bright')
     posterior = idata['posterior']
-    deviance = -2.0 * idata['log_likelihood']['total'].values
-
-    if params is None:
-        params = list(posterior.data_vars.keys())
-    elif isinstance(params, str):
-        params = [params]
-    else:
-        params = list(params)
-
-    all_params = posterior.data_vars.keys()
-    not_found = set(params) - set(all_params)
-    if not_found:
-        raise ValueError(f'parameter {not_found} not found in posterior')
-
+    params = _resolve_params(posterior, params)
     nparam = len(params)
 
+    # pull the raw arrays out of xarray once before the plotting loops
+    values = {p: posterior[p].values for p in params}
+    deviance = -2.0 * idata['log_likelihood']['total'].values
+    chain = posterior.chain.values
+    draw = posterior.draw.values
+    ndraw = draw.size
+    colors = get_colors(chain.size, palette='bright')
+
     if 'sample_stats' in idata:
         idx = idata['sample_stats']['diverging'].values.nonzero()
+    else:
+        idx = None
+
+    # skip divergence marking if there is no divergence
+    if idx is not None and idx[1].size > 0:
         diverging_index = idx[1]
-        diverging_sample = [
-            posterior[p].values[idx[0], idx[1]] for p in params
-        ]
+        # pointwise selection, only the diverging samples are loaded
+        diverging = posterior[params].isel(
+            chain=xr.DataArray(idx[0], dims='diverging'),
+            draw=xr.DataArray(idx[1], dims='diverging'),
+        )
+        diverging_sample = [diverging[p].values for p in params]
     else:
         diverging_index = None
         diverging_sample = None
@@ -250,15 +345,16 @@ def plot_trace(
     if len(labels) != nparam:
         raise ValueError('`tex` must match `params`')
 
-    plt.rcParams['axes.formatter.min_exponent'] = 3
-    fig, axes = plt.subplots(
+    if backend is None:
+        fig = plt.figure(figsize=(9, nparam * 2), tight_layout=True)
+    else:
+        fig = _make_figure(backend, figsize=(9, nparam * 2), tight_layout=True)
+    axes = fig.subplots(
         nrows=len(params),
         ncols=3,
         sharey='row',
         squeeze=False,
         gridspec_kw={'width_ratios': [3, 1, 1]},
-        figsize=(9, nparam * 2),
-        tight_layout=True,
     )
     fig.subplots_adjust(wspace=0.05, hspace=0)
     fig.align_ylabels(axes)
@@ -267,28 +363,25 @@ def plot_trace(
     axes[0, 1].set_title('posterior')
     axes[0, 2].set_title('deviance')
 
-    chain = posterior.chain.values
-    draw = posterior.draw.values
-    ndraw = posterior.draw.size
-    bw = max(draw.size // 100, 10)
+    bw = max(ndraw // 100, 10)
+    draw_slice = draw[:: bw // 2]
+    # about 4 points per pixel of the trace axes
+    nbins = int(4 * axes[0, 0].bbox.width)
 
     for i in range(nparam):
-        posterior_i = posterior[params[i]]
-        if axes_scale[i] == 'log' and np.all(posterior_i.values > 0):
-            scale = 'log'
-            log_scale = True
-        else:
-            scale = 'linear'
-            log_scale = False
+        # samples of all chains, shape (nchain, ndraw)
+        arr = values[params[i]]
+        log_scale = axes_scale[i] == 'log' and np.all(arr > 0)
+        # take the log of all chains at once
+        yarr = np.log(arr) if log_scale else arr
         axes[i, 0].set_ylabel(labels[i])
-        axes[i, 0].set_yscale(scale)
+        axes[i, 0].set_yscale('log' if log_scale else 'linear')
         for c in chain:
-            sample = posterior_i[c].values
+            sample = arr[c]
             loglike = deviance[c]
-            draw_slice = draw[:: bw // 2]
-            y = np.log(sample) if log_scale else sample
+            y = yarr[c]
             smoothed = gaussian_kernel_smooth(draw, y, bw, draw_slice)
-            x, kde = az.kde(y)
+            x, kde = _kde(y)
             if log_scale:
                 smoothed = np.exp(smoothed)
                 x = np.exp(x)
@@ -296,20 +389,49 @@ def plot_trace(
             color = colors[c]
             zorder = 10 - c
 
-            axes[i, 0].step(
-                draw + c / chain.size,
-                sample,
-                c=color,
-                alpha=0.4,
-                lw=0.15,
-                zorder=zorder,
-            )
+            if ndraw > 2 * nbins:
+                # long trace, draw the min/max envelope instead of every step,
+                # with a wider line to match the ink of the full step line
+                x_step = draw + c / chain.size
+                axes[i, 0].add_collection(
+                    LineCollection(
+                        _minmax_segments(x_step, sample, nbins),
+                        colors=[color],
+                        alpha=0.4,
+                        lw=0.25,
+                        zorder=zorder,
+                        rasterized=True,
+                    ),
+                    autolim=False,
+                )
+                # update the data limits in data space, autolim of
+                # add_collection is wrong for log scale
+                axes[i, 0].update_datalim(
+                    [(x_step[0], sample.min()), (x_step[-1], sample.max())]
+                )
+                axes[i, 0].autoscale_view()
+            else:
+                axes[i, 0].step(
+                    draw + c / chain.size,
+                    sample,
+                    c=color,
+                    alpha=0.4,
+                    lw=0.15,
+                    zorder=zorder,
+                    rasterized=True,
+                )
             axes[i, 0].plot(
                 draw_slice, smoothed, c=color, alpha=0.6, lw=1.5, zorder=zorder
             )
             axes[i, 1].plot(kde, x, c=color, alpha=0.6, lw=1.5, zorder=zorder)
             axes[i, 2].scatter(
-                loglike, sample, color=color, s=0.05, alpha=0.05, zorder=zorder
+                loglike,
+                sample,
+                color=color,
+                s=0.05,
+                alpha=0.05,
+                zorder=zorder,
+                rasterized=True,
             )
 
         axes[i, 0].set_xlim(0.5, ndraw - 0.5)
@@ -317,25 +439,156 @@ def plot_trace(
         axes[i, 1].set_xticks([])
 
     if diverging_index is not None:
+        span = 0.1
         for i in range(nparam):
-            ylim = axes[i, 0].get_ylim()
-            y_lower = ylim[0]
-
-            span = 0.1
-
+            y_lower, y_upper = axes[i, 0].get_ylim()
             if axes_scale[i] == 'linear':
-                y_upper = ylim[0] + span * np.diff(ylim)
+                y_upper = y_lower + span * (y_upper - y_lower)
             else:
-                y_upper = ylim[0] * np.exp(span * np.diff(np.log(ylim)))
+                y_upper = y_lower * (y_upper / y_lower) ** span
 
-            axes[i, 0].vlines(diverging_index, y_lower, y_upper, color='k')
-            axes[i, 0].set_ylim(ylim)
+            # mark divergences without changing the axes limits
+            segments = _mark_segments(diverging_index, y_lower, y_upper)
+            axes[i, 0].add_collection(
+                LineCollection(segments, colors='k'), autolim=False
+            )
 
-            xlim = axes[i, 1].get_xlim()
-            x_lower = xlim[0]
-            x_upper = xlim[0] + span * np.diff(xlim)
+            x_lower, x_upper = axes[i, 1].get_xlim()
+            x_upper = x_lower + span * (x_upper - x_lower)
+            segments = _mark_segments(diverging_sample[i], x_lower, x_upper)
+            # swap x and y to get horizontal segments
+            axes[i, 1].add_collection(
+                LineCollection(segments[..., ::-1], colors='k'), autolim=False
+            )
 
-            axes[i, 1].hlines(diverging_sample[i], x_lower, x_upper, color='k')
-            axes[i, 1].set_xlim(xlim)
+    _set_log_formatter(fig)
 
     return fig
+
+
+def _make_figure(backend: str, **kwargs) -> Figure:
+    """Create a figure rendered by `backend`, without using pyplot."""
+    # resolve the backend module in the same way as matplotlib.use
+    if backend.startswith('module://'):
+        name = backend[9:]
+    else:
+        name = f'matplotlib.backends.backend_{backend.lower()}'
+
+    try:
+        module = importlib.import_module(name)
+    except ImportError as e:
+        raise ValueError(f'cannot load backend {backend!r}: {e}') from e
+
+    if not hasattr(module, 'FigureCanvas'):
+        raise ValueError(f'{backend!r} is not a Matplotlib backend')
+
+    fig = Figure(**kwargs)
+    module.FigureCanvas(fig)
+    return fig
+
+
+class _LogFormatter(LogFormatterSciNotation):
+    """Log formatter that labels 1, 10 and 100 without exponent.
+
+    This has the same effect as setting ``axes.formatter.min_exponent`` to 3,
+    which is only read when the figure is drawn, but without touching the
+    global rcParams.
+    """
+
+    min_exponent = 3
+
+    def __call__(self, x, pos=None):
+        label = super().__call__(x, pos)
+        if label and x != 0:
+            fx = math.log(abs(x)) / math.log(self._base)
+            if abs(round(fx, 10)) < self.min_exponent:
+                return rf'$\mathdefault{{{x:g}}}$'
+        return label
+
+
+def _set_log_formatter(fig: Figure) -> None:
+    """Use :class:`_LogFormatter` for the labeled log axes of `fig`."""
+    for ax in fig.axes:
+        for axis in (ax.xaxis, ax.yaxis):
+            if axis.get_scale() != 'log':
+                continue
+            # hidden tick labels use other formatters, leave them as is
+            if isinstance(axis.get_major_formatter(), LogFormatterMathtext):
+                axis.set_major_formatter(_LogFormatter())
+            if isinstance(axis.get_minor_formatter(), LogFormatterMathtext):
+                axis.set_minor_formatter(_LogFormatter(labelOnlyBase=False))
+
+
+def _resolve_params(
+    posterior: xr.Dataset, params: str | Sequence[str] | None
+) -> list[str]:
+    """Get the list of parameters to plot and check if they are available."""
+    data_vars = posterior.data_vars
+    if params is None:
+        return list(data_vars)
+    elif isinstance(params, str):
+        params = [params]
+    else:
+        params = list(params)
+
+    not_found = [p for p in params if p not in data_vars]
+    if not_found:
+        raise ValueError(f'parameter {not_found} not found in posterior')
+
+    return params
+
+
+def _mark_segments(
+    position: np.ndarray, lower: float, upper: float
+) -> np.ndarray:
+    """Get vertical segments from `lower` to `upper` at each `position`."""
+    position = np.asarray(position, dtype=float)
+    return np.stack(
+        [
+            np.column_stack([position, np.full_like(position, lower)]),
+            np.column_stack([position, np.full_like(position, upper)]),
+        ],
+        axis=1,
+    )
+
+
+def _minmax_segments(x: np.ndarray, y: np.ndarray, nbins: int) -> np.ndarray:
+    """Decimate a step line into `nbins` vertical min/max segments."""
+    starts = np.linspace(0, x.size, nbins, endpoint=False).astype(int)
+    ymin = np.minimum.reduceat(y, starts)
+    ymax = np.maximum.reduceat(y, starts)
+
+    # include the first point of next bin to keep the line connected
+    ymin[:-1] = np.minimum(ymin[:-1], y[starts[1:]])
+    ymax[:-1] = np.maximum(ymax[:-1], y[starts[1:]])
+
+    ends = np.append(starts[1:], x.size) - 1
+    xmid = 0.5 * (x[starts] + x[ends])
+    return np.stack(
+        [np.column_stack([xmid, ymin]), np.column_stack([xmid, ymax])],
+        axis=1,
+    )
+
+
+def _kde(sample: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Get kernel density estimate of `sample`, reusing previous results.
+
+    The results are cached on a digest of `sample`, so that the cache does
+    not keep the samples alive.
+    """
+    sample = np.ascontiguousarray(sample, dtype=np.float64)
+    key = (hashlib.blake2b(sample).digest(), sample.shape)
+
+    if (result := _KDE_CACHE.get(key)) is not None:
+        _KDE_CACHE.move_to_end(key)
+        return result
+
+    grid, pdf = az.kde(sample.ravel())
+    grid.flags.writeable = False
+    pdf.flags.writeable = False
+
+    _KDE_CACHE[key] = grid, pdf
+    if len(_KDE_CACHE) > _KDE_CACHE_SIZE:
+        _KDE_CACHE.popitem(last=False)
+
+    return grid, pdf
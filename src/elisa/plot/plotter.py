@@ -1347,7 +1347,7 @@ class MLEResultPlotter(Plotter):
         self,
         params: str | Sequence[str] | None = None,
         color: str | None = None,
-        bins: int | Sequence[int] = 40,
+        bins: int | Sequence[int] | None = None,
         hist_bin_factor: float | Sequence[float] = 1.5,
         fig_path: str | None = None,
     ) -> Figure:
@@ -1362,7 +1362,8 @@ class MLEResultPlotter(Plotter):
         bins : int or list of int, optional
             The number of bins to use in histograms, either as a fixed value
             for all dimensions, or as a list of integers for each dimension.
-            The default is 40.
+            The default is chosen from the number of samples ``n``, i.e.,
+            ``int(min(40, max(10, sqrt(n / 20))))``.
         hist_bin_factor : float or list of float, optional
             This is a factor (or list of factors, one for each dimension)
             that will multiply the bin specifications when making the 1-D
@@ -1561,7 +1562,7 @@ class PosteriorResultPlotter(Plotter):
         params: str | Sequence[str] | None = None,
         color: str | None = None,
         divergences: bool = True,
-        bins: int | Sequence[int] = 40,
+        bins: int | Sequence[int] | None = None,
         hist_bin_factor: float | Sequence[float] = 1.5,
         fig_path: str | None = None,
     ) -> Figure:
@@ -1578,7 +1579,8 @@ class PosteriorResultPlotter(Plotter):
         bins : int or list of int, optional
             The number of bins to use in histograms, either as a fixed value
             for all dimensions, or as a list of integers for each dimension.
-            The default is 40.
+            The default is chosen from the number of samples ``n``, i.e.,
+            ``int(min(40, max(10, sqrt(n / 20))))``.
         hist_bin_factor : float or list of float, optional
             This is a factor (or list of factors, one for each dimension)
             that will multiply the bin specifications when making the 1-D
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from functools import lru_cache
 from itertools import cycle
 
 import numpy as np
 import seaborn as sns
+from scipy.ndimage import gaussian_filter1d
 
 from elisa.util.typing import NumPyArray as NDArray
 
@@ -13,10 +16,24 @@ from elisa.util.typing import NumPyArray as NDArray
 def get_colors(
     n: int, palette: str = 'husl'
 ) -> list[tuple[float, float, float]]:
+    if isinstance(palette, str):
+        colors = _get_colors_cached(int(n), palette)
+    else:
+        colors = _get_colors(int(n), palette)
+    # return a copy so that the cached colors are not modified
+    return list(colors)
+
+
+def _get_colors(
+    n: int, palette: str | Sequence
+) -> tuple[tuple[float, float, float], ...]:
     if len(colors := sns.color_palette(palette)) >= n:
-        return colors[:n]
+        return tuple(colors[:n])
     else:
-        return sns.color_palette(palette, n)
+        return tuple(sns.color_palette(palette, n))
+
+
+_get_colors_cached = lru_cache(maxsize=64)(_get_colors)
 
 
 def get_markers(n: int) -> list[str]:
@@ -78,18 +95,26 @@ def get_contour_colors(
     factor_f: float = 0.72,
 ) -> tuple:
     """Create two sets of colors for contour and contourf plots."""
-    color = str(color)
-    n = int(n)
-    factor_min = float(factor_min)
-    factor_max = float(factor_max)
-    f = float(factor_f)
+    contour_colors, contourf_colors = _get_contour_colors(
+        str(color),
+        int(n),
+        float(factor_min),
+        float(factor_max),
+        float(factor_f),
+    )
+    # return copies so that the cached colors are not modified
+    return list(contour_colors), list(contourf_colors)
+
 
+@lru_cache(maxsize=64)
+def _get_contour_colors(
+    color: str, n: int, factor_min: float, factor_max: float, f: float
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
     contourf_colors = get_color_gradient(color, n, factor_min, factor_max)
     contour_colors = get_color_gradient(
         color, n, f * factor_min, f * factor_max
     )
-
-    return contour_colors, contourf_colors
+    return tuple(contour_colors), tuple(contourf_colors)
 
 
 def gaussian_kernel_smooth(
@@ -128,6 +153,13 @@ def gaussian_kernel_smooth(
     smoothed : ndarray
         Smoothed data at `x_eval`.
 
+    Notes
+    -----
+    If `x` is a uniform grid and `x_eval` is a subset of `x`, the sum is
+    computed with :func:`scipy.ndimage.gaussian_filter1d`, which truncates
+    the kernel at 4 sigma. The result then differs slightly from the exact
+    sum, by about 1e-5 of the range of `y` for a random walk.
+
     References
     ----------
     .. [1] https://en.wikipedia.org/wiki/Kernel_regression
@@ -142,6 +174,23 @@ def gaussian_kernel_smooth(
     # from statsmodels.nonparametric.kernel_regression import KernelReg
     # return KernelReg(y, x, 'c', 'lc', [sigma]).fit(x_eval)[0]
 
+    x = np.asarray(x)
+    x_eval = np.asarray(x_eval)
+
+    if (grid := _uniform_grid_index(x, x_eval)) is not None:
+        # on a uniform grid the regression is a discrete convolution
+        idx, dx = grid
+        sd = sigma / dx
+        radius = int(4.0 * sd + 0.5)  # the default truncation of scipy
+        k = np.arange(-radius, radius + 1) / sd
+        weights_norm = np.exp(-0.5 * k * k).sum()
+        y = np.asarray(y, dtype=np.float64)
+        smoothed = gaussian_filter1d(y, sd, mode='constant')[idx]
+        weights = gaussian_filter1d(np.ones_like(y), sd, mode='constant')
+        weights = weights[idx]
+        smoothed[weights * weights_norm < null_thresh] = np.nan
+        return smoothed / weights
+
     delta_x = x_eval[:, None] - x
 
     # Calculate weight of every value in delta_x using Gaussian
@@ -162,3 +211,28 @@ def gaussian_kernel_smooth(
     smoothed = smoothed / weights.sum(1)
 
     return smoothed
+
+
+def _uniform_grid_index(
+    x: NDArray, x_eval: NDArray
+) -> tuple[NDArray, float] | None:
+    """Get the index of `x_eval` in `x` if `x` is a uniform grid containing
+    `x_eval`, otherwise return None.
+    """
+    if x.ndim != 1 or x.size < 2 or x_eval.ndim != 1 or x_eval.size == 0:
+        return None
+
+    dx = float(x[1] - x[0])
+    if dx <= 0.0 or not np.allclose(np.diff(x), dx):
+        return None
+
+    idx = (x_eval - x[0]) / dx
+    idx_int = np.rint(idx).astype(int)
+    if (
+        not np.allclose(idx, idx_int)
+        or idx_int.min() < 0
+        or idx_int.max() >= x.size
+    ):
+        return None
+
+    return idx_int, dx
@@ -14,16 +14,28 @@ if TYPE_CHECKING:
     from typing import Literal
 
 
-def jax_enable_x64(use_x64: bool) -> None:
+def _getenv_bool(name: str, default: bool) -> bool:
+    """Get a boolean flag from the environment variable `name`."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in {'', '0', 'false', 'no', 'off'}
+
+
+def jax_enable_x64(use_x64: bool | None = None) -> None:
     """Changes the default float precision of arrays in JAX.
 
     Parameters
     ----------
-    use_x64 : bool
-        When ``True``, JAX arrays will use 64 bits else 32 bits.
+    use_x64 : bool, optional
+        When ``True``, JAX arrays will use 64 bits else 32 bits, unless the
+        environment variable ``JAX_ENABLE_X64`` is set to true. The default
+        is read from ``JAX_ENABLE_X64``, and is ``True`` if it is not set.
     """
-    if not use_x64:
-        use_x64 = os.getenv('JAX_ENABLE_X64', 0)
+    if use_x64 is None:
+        use_x64 = _getenv_bool('JAX_ENABLE_X64', True)
+    elif not use_x64:
+        use_x64 = _getenv_bool('JAX_ENABLE_X64', False)
     jax.config.update('jax_enable_x64', bool(use_x64))
 
 
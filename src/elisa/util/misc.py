@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import math
 import re
-from functools import reduce
 from threading import Lock
 from typing import TYPE_CHECKING
 
@@ -350,11 +349,20 @@ def replace_string(value: T, mapping: dict[str, str]) -> T:
     replaced : iterable or mapping
         Value of `value` replaced with `mapping`.
     """
-    mapping = mapping.items()
+    if mapping:
+        # match longer keys first so that overlapping keys are not clobbered
+        keys = sorted(mapping, key=len, reverse=True)
+        pattern = re.compile('|'.join(map(re.escape, keys)))
 
-    def replace_with_mapping(s: str):
-        """Replace all k in s with v, as in mapping."""
-        return reduce(lambda x, kv: x.replace(*kv), mapping, s)
+        def replace_with_mapping(s: str):
+            """Replace all k in s with v, as in mapping."""
+            return pattern.sub(lambda m: mapping[m.group(0)], s)
+
+    else:
+
+        def replace_with_mapping(s: str):
+            """Nothing to replace."""
+            return s
 
     def replace_dict(d: dict):
         """Replace key and value of a dict."""
@@ -1,3 +1,4 @@
+import dill
 import jax
 import numpy as np
 from astropy.cosmology import Planck18
@@ -17,6 +18,39 @@ def test_name():
     assert model3.name == 'ZAShift(PowerLaw)'
 
 
+def test_latex():
+    model = PhAbs() * PowerLaw()
+    latex = r'{\mathrm{PhAbs}} \times {\mathrm{PowerLaw}}'
+    assert model.latex == latex
+
+    model.PowerLaw.latex = r'\mathrm{PL}'
+    assert model.latex == r'{\mathrm{PhAbs}} \times {\mathrm{PL}}'
+    assert model._cid_to_clatex[model.PowerLaw._id] == r'\mathrm{PL}'
+
+
+def test_eval_cache():
+    model = PhAbs() * (PowerLaw() + PowerLaw())
+    fn = model.eval
+    assert model.eval is fn
+
+    model.PhAbs.method = 'simpson'
+    assert model.eval is not fn
+
+
+def test_cache_pickle():
+    model = PhAbs() * PowerLaw()
+    assert model.latex == r'{\mathrm{PhAbs}} \times {\mathrm{PowerLaw}}'
+    _ = model.eval
+
+    model2 = dill.loads(dill.dumps(model))
+    assert model2._Model__latex is None
+    assert model2._Model__eval is None
+
+    model2.PowerLaw.latex = r'\mathrm{PL}'
+    assert model2.latex == r'{\mathrm{PhAbs}} \times {\mathrm{PL}}'
+    assert model.latex == r'{\mathrm{PhAbs}} \times {\mathrm{PowerLaw}}'
+
+
 def test_str_repr():
     model = ZAShift(1.0)(PhAbs() * PowerLaw())
     compiled = model.compile()
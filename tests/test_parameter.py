@@ -1,4 +1,6 @@
-from elisa.models.parameter import UniformParameter
+import dill
+
+from elisa.models.parameter import Parameter, UniformParameter
 
 
 def test_param_name():
@@ -7,3 +9,49 @@ def test_param_name():
     b = a + a2
     assert str(b) == "a + a'"
     assert b.default == 2.0
+
+
+def test_param_latex():
+    a = UniformParameter('a', 1.5, 0.0, 2.0)
+    b = UniformParameter('b', 0.5, 0.0, 2.0)
+    c = a * b
+    assert c.latex == r'{a} \times {b}'
+
+    a.latex = r'\alpha'
+    assert c.latex == r'{\alpha} \times {b}'
+
+
+def test_param_info():
+    a = UniformParameter('a', 1.5, 0.0, 2.0)
+    b = UniformParameter('b', 0.5, 0.0, 2.0)
+    c = a + b
+    assert c._info[a._id].default == 1.5
+    assert c.default == 2.0
+    assert not c._info[c._id].fixed
+
+    a.default = 1.0
+    a.fixed = True
+    b.fixed = True
+    assert c._info[a._id].default == 1.0
+    assert c.default == 1.5
+    assert c._info[c._id].fixed
+
+
+def test_param_cache_pickle():
+    a = UniformParameter('a', 1.5, 0.0, 2.0)
+    b = UniformParameter('b', 0.5, 0.0, 2.0)
+    c = a + b
+    assert c.default == 2.0
+    assert c.log is False and c.fixed is False
+    version = Parameter._version
+
+    a2, c2 = dill.loads(dill.dumps((a, c)))
+    assert c2._cache == {}
+    try:
+        # the version counter restarts in a new process
+        Parameter._version = version - 1
+        a2.default = 1.0
+        assert Parameter._version == version
+        assert c2.default == 1.5
+    finally:
+        Parameter._version = version + 1
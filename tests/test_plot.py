@@ -0,0 +1,204 @@
+from collections import OrderedDict
+
+import arviz as az
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_svg import FigureCanvasSVG
+
+from elisa.plot import misc
+from elisa.plot.misc import (
+    _kde,
+    _stack_samples,
+    plot_corner,
+    plot_trace,
+)
+from elisa.plot.util import gaussian_kernel_smooth
+
+
+def _dense_kernel_smooth(x, y, sigma, x_eval, null_thresh=0.6):
+    weights = np.exp(-0.5 * ((x_eval[:, None] - x) / sigma) ** 2)
+    smoothed = weights @ y / weights.sum(1)
+    smoothed[weights.sum(1) < null_thresh] = np.nan
+    return smoothed
+
+
+@pytest.mark.parametrize('n', [500, 5000])
+def test_gaussian_kernel_smooth(n):
+    rng = np.random.default_rng(42)
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.normal(size=n))
+    sigma = max(n // 100, 10)
+    x_eval = x[:: sigma // 2]
+
+    # uniform grid, the kernel is truncated at 4 sigma
+    smoothed = gaussian_kernel_smooth(x, y, sigma, x_eval)
+    expected = _dense_kernel_smooth(x, y, sigma, x_eval)
+    assert np.allclose(smoothed, expected, rtol=0, atol=1e-4 * np.ptp(y))
+
+    # non-uniform grid, the exact sum is used
+    x2 = np.sort(rng.uniform(0, n, n))
+    smoothed = gaussian_kernel_smooth(x2, y, sigma, x_eval)
+    expected = _dense_kernel_smooth(x2, y, sigma, x_eval)
+    assert np.allclose(smoothed, expected)
+
+
+def test_gaussian_kernel_smooth_null_thresh():
+    x = np.arange(100, dtype=float)
+    y = np.sin(x / 10)
+    sigma = 2.0
+
+    # evaluation points outside the data
+    x_eval = np.array([-20.0, 0.0, 50.0, 99.0, 120.0])
+    smoothed = gaussian_kernel_smooth(x, y, sigma, x_eval)
+    assert np.isnan(smoothed[[0, -1]]).all()
+    assert np.isfinite(smoothed[1:-1]).all()
+
+    # the total weight at the edges is about half of that in the middle
+    null_thresh = 0.75 * np.sqrt(2.0 * np.pi) * sigma
+    smoothed = gaussian_kernel_smooth(x, y, sigma, null_thresh=null_thresh)
+    expected = _dense_kernel_smooth(x, y, sigma, x, null_thresh)
+    assert np.isnan(smoothed[[0, -1]]).all()
+    assert np.array_equal(np.isnan(smoothed), np.isnan(expected))
+    mask = ~np.isnan(expected)
+    assert np.allclose(smoothed[mask], expected[mask], rtol=0, atol=1e-4)
+
+
+def test_kde_cache(monkeypatch):
+    ncall = 0
+    kde = az.kde
+
+    def counted_kde(*args, **kwargs):
+        nonlocal ncall
+        ncall += 1
+        return kde(*args, **kwargs)
+
+    monkeypatch.setattr(az, 'kde', counted_kde)
+    monkeypatch.setattr(misc, '_KDE_CACHE', OrderedDict())
+    monkeypatch.setattr(misc, '_KDE_CACHE_SIZE', 2)
+
+    rng = np.random.default_rng(42)
+    sample = rng.normal(size=10000)
+    grid, pdf = _kde(sample)
+    assert ncall == 1
+    assert not grid.flags.writeable and not pdf.flags.writeable
+
+    # an equal sample reuses the result
+    grid2, pdf2 = _kde(sample.copy())
+    assert ncall == 1
+    assert np.array_equal(grid2, grid) and np.array_equal(pdf2, pdf)
+
+    grid3, _ = _kde(sample + 1.0)
+    assert ncall == 2
+    assert np.allclose(grid3, grid + 1.0)
+
+    # the least recently used result is evicted
+    _kde(sample)
+    _kde(sample + 2.0)
+    assert ncall == 3
+    _kde(sample)
+    _kde(sample + 2.0)
+    assert ncall == 3
+    _kde(sample + 1.0)
+    assert ncall == 4
+
+
+def test_plot_trace_log_ylim():
+    rng = np.random.default_rng(42)
+    nchain, ndraw = 4, 20000
+    sample = rng.uniform(334.0, 777.0, (nchain, ndraw))
+    idata = az.from_dict(
+        posterior={'a': sample},
+        log_likelihood={'total': rng.normal(size=(nchain, ndraw))},
+    )
+
+    # the long trace is drawn as a min/max envelope
+    fig = plot_trace(idata, axes_scale='log')
+    ylim = fig.axes[0].get_ylim()
+    plt.close(fig)
+    assert fig.axes[0].get_yscale() == 'log'
+    assert 300.0 < ylim[0] < sample.min()
+    assert sample.max() < ylim[1] < 850.0
+
+
+def _posterior_idata(nchain=2, ndraw=500, seed=42):
+    rng = np.random.default_rng(seed)
+    return az.from_dict(
+        posterior={
+            'a': rng.normal(size=(nchain, ndraw)),
+            'b': rng.lognormal(size=(nchain, ndraw)),
+        },
+        log_likelihood={'total': rng.normal(size=(nchain, ndraw))},
+        sample_stats={'diverging': rng.random((nchain, ndraw)) < 0.01},
+    )
+
+
+@pytest.mark.parametrize(
+    'backend, canvas',
+    [
+        ('agg', FigureCanvasAgg),
+        ('Agg', FigureCanvasAgg),
+        ('svg', FigureCanvasSVG),
+        ('module://matplotlib.backends.backend_agg', FigureCanvasAgg),
+    ],
+)
+def test_plot_backend(backend, canvas):
+    idata = _posterior_idata()
+    nfig = len(plt.get_fignums())
+
+    fig = plot_corner(idata, backend=backend)
+    assert type(fig.canvas) is canvas
+    assert len(fig.axes) == 4
+
+    fig = plot_trace(idata, backend=backend)
+    assert type(fig.canvas) is canvas
+    assert len(fig.axes) == 6
+
+    # pyplot is not used
+    assert len(plt.get_fignums()) == nfig
+
+
+def test_plot_unknown_backend():
+    idata = _posterior_idata()
+    with pytest.raises(ValueError):
+        plot_corner(idata, backend='no_such_backend')
+    with pytest.raises(ValueError):
+        plot_trace(idata, backend='module://no_such_module')
+
+
+def test_plot_corner_reuse_fig():
+    idata = _posterior_idata()
+    fig = plot_corner(idata, backend='agg')
+    axes = list(fig.axes)
+
+    # the K x K axes are cleared and reused
+    fig2 = plot_corner(_posterior_idata(seed=0), fig=fig)
+    assert fig2 is fig
+    assert fig.axes == axes
+
+    # the limits follow the new samples rather than the old ones
+    b = _posterior_idata(seed=0)['posterior']['b'].values
+    assert np.allclose(fig.axes[-1].get_xlim(), (b.min(), b.max()))
+
+    # a figure with a different layout is cleared
+    fig3 = plot_corner(idata, params='a', fig=fig)
+    assert fig3 is fig
+    assert len(fig.axes) == 1
+
+
+def test_stack_samples():
+    rng = np.random.default_rng(42)
+    a = rng.normal(size=1000)
+    b = rng.lognormal(size=1000)
+
+    stacked = _stack_samples([a, b])
+    assert stacked.dtype == np.float32
+    assert stacked.shape == (1000, 2)
+    assert np.allclose(stacked, np.column_stack([a, b]), rtol=1e-6)
+
+    # float32 cannot resolve the spread of the samples
+    c = 1e4 + 1e-6 * a
+    stacked = _stack_samples([a, c])
+    assert stacked.dtype == np.float64
+    assert np.array_equal(stacked[:, 1], c)